@@ -2,52 +2,78 @@
 
 import asyncio
 import time
-from typing import Optional
+from enum import IntEnum
+from typing import Awaitable, Callable, Optional
 
 from .messenger import A2AMessenger
 from .sandbox_manager import SandboxManager
 from .task_loader import TaskLoader
 from .test_runner import TestRunner
-from .metrics import MetricsCollector
+from .metrics import MetricsCollector, TaskResult
+
+
+class _Status(IntEnum):
+    """Evaluator lifecycle states."""
+
+    IDLE = 0
+    RUNNING = 1
+    COMPLETED = 2
+    ERROR = 3
 
 
 class TerminalBenchEvaluator:
     """Main evaluation loop for TerminalBench tasks."""
 
+    IDLE_STATUS = "Evaluator is idle. Send 'run' to start evaluation."
+    COMPLETED_STATUS = "Evaluation completed. Results available."
+
     def __init__(
         self,
         dataset: str,
         max_turns: int,
         task_timeout: int,
         participant_url: str,
+        max_concurrent_tasks: int = 1,
+        sandbox_pool_size: int = 0,
     ):
         self.dataset = dataset
         self.max_turns = max_turns
         self.task_timeout = task_timeout
         self.participant_url = participant_url
+        self.max_concurrent_tasks = max(1, max_concurrent_tasks)
 
         self.task_loader = TaskLoader(dataset)
-        self.sandbox_manager = SandboxManager()
+        self.sandbox_manager = SandboxManager(pool_size=sandbox_pool_size)
         self.test_runner = TestRunner()
         self.metrics = MetricsCollector()
         self.messenger = A2AMessenger(participant_url)
 
-        self._status = "idle"
-        self._current_task: Optional[str] = None
+        self._status = _Status.IDLE
+        self._error_msg = ""
+        self._current_tasks: set[str] = set()
 
     def get_status(self) -> str:
         """Get current evaluator status."""
-        if self._status == "idle":
-            return "Evaluator is idle. Send 'run' to start evaluation."
-        elif self._status == "running":
-            return f"Evaluation in progress. Current task: {self._current_task}"
-        elif self._status == "completed":
-            return "Evaluation completed. Results available."
-        return f"Status: {self._status}"
-
-    async def run_evaluation(self) -> dict:
-        """Run the full TerminalBench evaluation."""
-        self._status = "running"
+        status = self._status
+        if status is _Status.RUNNING:
+            current = ", ".join(sorted(self._current_tasks)) or "none"
+            return f"Evaluation in progress. Current tasks: {current}"
+        if status is _Status.IDLE:
+            return self.IDLE_STATUS
+        if status is _Status.COMPLETED:
+            return self.COMPLETED_STATUS
+        return f"Status: error: {self._error_msg}"
+
+    async def run_evaluation(
+        self,
+        on_result: Optional[Callable[[TaskResult], Awaitable[None]]] = None,
+    ) -> dict:
+        """Run the full TerminalBench evaluation.
+
+        If given, on_result is awaited with each task's result as soon as
+        that task finishes, so callers can report progress incrementally.
+        """
+        self._status = _Status.RUNNING
         self.metrics.reset()
 
         try:
@@ -55,22 +81,58 @@ class TerminalBenchEvaluator:
             tasks = await self.task_loader.load_tasks()
             self.metrics.set_total_tasks(len(tasks))
 
-            # Evaluate each task
-            for task in tasks:
-                self._current_task = task.task_id
-                result = await self._evaluate_task(task)
-                self.metrics.record_result(result)
+            # Pull every image up front, overlapping pulls with early tasks
+            self.sandbox_manager.prefetch_images({task.docker_image for task in tasks})
+            self.sandbox_manager.expect_sandboxes(tasks)
+
+            # Evaluate tasks concurrently, bounded by max_concurrent_tasks
+            sem = asyncio.Semaphore(self.max_concurrent_tasks)
+
+            async def _bounded(task) -> None:
+                async with sem:
+                    self._current_tasks.add(task.task_id)
+                    try:
+                        result = await self._evaluate_task(task)
+                    except Exception as e:
+                        result = TaskResult(
+                            task_id=task.task_id,
+                            passed=False,
+                            reward=0.0,
+                            turns=0,
+                            total_time=0.0,
+                            error=str(e),
+                        )
+                    finally:
+                        self._current_tasks.discard(task.task_id)
 
-            self._status = "completed"
+                self.metrics.record_result(result)
+                if on_result is not None:
+                    await on_result(result)
+
+            # If on_result raises, the TaskGroup cancels and awaits the other
+            # tasks, so none are still running when the finally cleans up
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for task in tasks:
+                        tg.create_task(_bounded(task))
+            except ExceptionGroup as group:
+                raise group.exceptions[0]
+
+            self._status = _Status.COMPLETED
             return self.metrics.get_results()
 
         except Exception as e:
-            self._status = f"error: {e}"
+            self._status = _Status.ERROR
+            self._error_msg = str(e)
             raise
+        finally:
+            # Remove any warm pooled containers left over from this run
+            await self.sandbox_manager.cleanup_all()
+            await self.sandbox_manager.close()
 
-    async def _evaluate_task(self, task) -> dict:
+    async def _evaluate_task(self, task) -> TaskResult:
         """Evaluate a single TerminalBench task."""
-        start_time = time.time()
+        start_time = time.monotonic()
         turns = 0
         error = None
         passed = False
@@ -116,13 +178,15 @@ class TerminalBenchEvaluator:
                     )
 
                 # Check timeout
-                if time.time() - start_time > self.task_timeout:
+                if time.monotonic() - start_time > self.task_timeout:
                     error = "Task timeout exceeded"
                     break
 
             # Run test script to verify completion
             if not error:
-                test_result = await self.test_runner.run_test(sandbox, task)
+                test_result = await self.test_runner.run_test(
+                    sandbox, task, sandbox_manager=self.sandbox_manager
+                )
                 passed = test_result.get("passed", False)
                 if not passed and test_result.get("error"):
                     error = test_result["error"]
@@ -136,13 +200,13 @@ class TerminalBenchEvaluator:
             if sandbox:
                 await self.sandbox_manager.cleanup_sandbox(sandbox)
 
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
 
-        return {
-            "task_id": task.task_id,
-            "passed": passed,
-            "reward": 1.0 if passed else 0.0,
-            "turns": turns,
-            "total_time": total_time,
-            "error": error,
-        }
+        return TaskResult(
+            task_id=task.task_id,
+            passed=passed,
+            reward=1.0 if passed else 0.0,
+            turns=turns,
+            total_time=total_time,
+            error=error,
+        )
@@ -0,0 +1,207 @@
+"""Async Docker Engine API client over the local Unix socket."""
+
+import asyncio
+import os
+import struct
+from typing import AsyncIterator, Optional
+
+import aiohttp
+import docker
+import orjson
+
+# Newest API version this client speaks; older daemons are talked to at theirs
+DOCKER_API_VERSION = "1.43"
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+# Host part is ignored when the connection goes over a Unix socket
+_UNIX_BASE_URL = "http://docker"
+
+# Multiplexed exec stream frame header: stream type, 3 pad bytes, payload size
+_FRAME_HEADER = struct.Struct(">BxxxL")
+
+STDOUT_STREAM = 1
+STDERR_STREAM = 2
+
+
+def _version_tuple(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split("."))
+
+
+class DockerAPI:
+    """Minimal natively-async client for the Docker Engine HTTP API."""
+
+    def __init__(self, socket_path: Optional[str] = None):
+        if socket_path is None:
+            socket_path, self._base_url = self._endpoint_from_env()
+        else:
+            self._base_url = _UNIX_BASE_URL
+        # None when talking to the daemon over TCP
+        self.socket_path = socket_path
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._api_version: Optional[str] = None
+
+    @staticmethod
+    def _endpoint_from_env() -> tuple[Optional[str], str]:
+        """Resolve (socket path, base URL) from DOCKER_HOST.
+
+        Must reach the same daemon docker.from_env() uses for image pulls, so
+        endpoints this client can't talk to are rejected rather than ignored.
+        """
+        host = os.getenv("DOCKER_HOST", "")
+        if not host:
+            return DEFAULT_DOCKER_SOCKET, _UNIX_BASE_URL
+        if host.startswith("unix://"):
+            return host[len("unix://") :], _UNIX_BASE_URL
+        tls = os.getenv("DOCKER_TLS_VERIFY") or os.getenv("DOCKER_CERT_PATH")
+        if host.startswith("tcp://") and not tls:
+            return None, "http://" + host[len("tcp://") :].rstrip("/")
+        raise docker.errors.DockerException(
+            f"Unsupported DOCKER_HOST {host!r}: only unix:// sockets and "
+            "tcp:// without TLS are supported"
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the HTTP session bound to the Docker daemon."""
+        if self._session is None or self._session.closed:
+            if self.socket_path is not None:
+                connector = aiohttp.UnixConnector(path=self.socket_path)
+            else:
+                connector = aiohttp.TCPConnector()
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None),
+            )
+        return self._session
+
+    async def _negotiate_version(self) -> str:
+        """Pick the newest API version both this client and the daemon support.
+
+        Queried once per client, like docker-py's version="auto".
+        """
+        if self._api_version is None:
+            session = self._get_session()
+            # /version is the one endpoint every daemon serves unversioned
+            async with session.get(f"{self._base_url}/version") as response:
+                body = await response.read()
+                self._raise_for_status(response.status, body)
+            daemon_version = orjson.loads(body).get("ApiVersion", DOCKER_API_VERSION)
+            self._api_version = min(
+                daemon_version, DOCKER_API_VERSION, key=_version_tuple
+            )
+        return self._api_version
+
+    async def _url(self, path: str) -> str:
+        return f"{self._base_url}/v{await self._negotiate_version()}{path}"
+
+    @staticmethod
+    def _raise_for_status(status: int, body: bytes) -> None:
+        """Map Docker API error responses onto docker-py exceptions."""
+        if status < 400:
+            return
+        message = body.decode("utf-8", errors="replace")
+        if status == 404:
+            raise docker.errors.NotFound(message)
+        raise docker.errors.APIError(f"{status}: {message}")
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+    ) -> bytes:
+        """Issue a request and return the raw response body."""
+        session = self._get_session()
+        async with session.request(
+            method, await self._url(path), params=params, json=json
+        ) as response:
+            body = await response.read()
+            self._raise_for_status(response.status, body)
+            return body
+
+    async def _request_json(
+        self,
+        method: str,
+        path: str,
+        json: Optional[dict] = None,
+    ) -> dict:
+        """Issue a request and decode the JSON response body."""
+        return orjson.loads(await self._request(method, path, json=json))
+
+    async def image_exists(self, image: str) -> bool:
+        """Check whether an image is present locally."""
+        try:
+            await self._request("GET", f"/images/{image}/json")
+        except docker.errors.NotFound:
+            return False
+        return True
+
+    async def create_container(self, config: dict) -> str:
+        """Create a container and return its ID."""
+        created = await self._request_json("POST", "/containers/create", json=config)
+        return created["Id"]
+
+    async def start_container(self, container_id: str) -> None:
+        """Start a created container."""
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def stop_container(self, container_id: str, timeout: int = 5) -> None:
+        """Stop a running container."""
+        await self._request(
+            "POST", f"/containers/{container_id}/stop", params={"t": str(timeout)}
+        )
+
+    async def remove_container(self, container_id: str, force: bool = True) -> None:
+        """Remove a container."""
+        await self._request(
+            "DELETE",
+            f"/containers/{container_id}",
+            params={"force": "true" if force else "false"},
+        )
+
+    async def exec_create(
+        self,
+        container_id: str,
+        cmd: list[str],
+        workdir: Optional[str] = None,
+    ) -> str:
+        """Create an exec instance attached to stdout/stderr and return its ID."""
+        config = {
+            "Cmd": cmd,
+            "AttachStdout": True,
+            "AttachStderr": True,
+        }
+        if workdir:
+            config["WorkingDir"] = workdir
+
+        created = await self._request_json(
+            "POST", f"/containers/{container_id}/exec", json=config
+        )
+        return created["Id"]
+
+    async def exec_stream(self, exec_id: str) -> AsyncIterator[tuple[int, bytes]]:
+        """Start an exec and yield (stream, payload) frames until it exits."""
+        session = self._get_session()
+        async with session.post(
+            await self._url(f"/exec/{exec_id}/start"),
+            json={"Detach": False, "Tty": False},
+        ) as response:
+            if response.status >= 400:
+                self._raise_for_status(response.status, await response.read())
+
+            while True:
+                try:
+                    header = await response.content.readexactly(_FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    return
+                stream, size = _FRAME_HEADER.unpack(header)
+                yield stream, await response.content.readexactly(size)
+
+    async def exec_inspect(self, exec_id: str) -> dict:
+        """Get exec instance details, including ExitCode once finished."""
+        return await self._request_json("GET", f"/exec/{exec_id}/json")
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,6 +1,7 @@
 """A2A request handler for the green agent."""
 
 import asyncio
+import re
 from typing import AsyncIterable
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
@@ -18,6 +19,10 @@ from a2a.types import (
 )
 
 from .agent import TerminalBenchEvaluator
+from .metrics import TaskResult
+
+# Request keywords, matched case-insensitively as substrings in one pass
+_CMD_RE = re.compile(r"run|evaluate|status", re.IGNORECASE)
 
 
 class GreenAgentExecutor(AgentExecutor):
@@ -29,12 +34,16 @@ class GreenAgentExecutor(AgentExecutor):
         max_turns: int,
         task_timeout: int,
         participant_url: str,
+        max_concurrent_tasks: int = 1,
+        sandbox_pool_size: int = 0,
     ):
         self.evaluator = TerminalBenchEvaluator(
             dataset=dataset,
             max_turns=max_turns,
             task_timeout=task_timeout,
             participant_url=participant_url,
+            max_concurrent_tasks=max_concurrent_tasks,
+            sandbox_pool_size=sandbox_pool_size,
         )
 
     async def execute(
@@ -56,9 +65,12 @@ class GreenAgentExecutor(AgentExecutor):
         request_text = self._extract_text(user_message)
 
         # Handle different request types
-        if "run" in request_text.lower() or "evaluate" in request_text.lower():
+        match = _CMD_RE.search(request_text)
+        command = match.group(0).lower() if match else None
+
+        if command == "run" or command == "evaluate":
             await self._run_evaluation(event_queue, task, request_text)
-        elif "status" in request_text.lower():
+        elif command == "status":
             await self._send_status(event_queue, task)
         else:
             await self._send_help(event_queue, task)
@@ -78,9 +90,22 @@ class GreenAgentExecutor(AgentExecutor):
             )
         )
 
+        async def _report_progress(result: TaskResult) -> None:
+            outcome = "pass" if result.passed else "fail"
+            await event_queue.put(
+                Event(
+                    task_id=task.id,
+                    status=TaskStatus(state=TaskState.working),
+                    artifact=Message(
+                        role=Role.agent,
+                        parts=[TextPart(text=f"Task {result.task_id}: {outcome}")],
+                    ),
+                )
+            )
+
         try:
-            # Run the evaluation
-            results = await self.evaluator.run_evaluation()
+            # Run the evaluation, reporting each task as it finishes
+            results = await self.evaluator.run_evaluation(on_result=_report_progress)
 
             # Format results as response
             response_text = self._format_results(results)
@@ -167,11 +192,14 @@ The evaluator will:
 
     def _get_last_user_message(self, task: Task) -> Message | None:
         """Get the last user message from the task history."""
-        if task.history:
-            for msg in reversed(task.history):
-                if msg.role == Role.user:
-                    return msg
-        return None
+        history = task.history
+        if not history:
+            return None
+        # Common case: the newest message is the user's request
+        last = history[-1]
+        if last.role == Role.user:
+            return last
+        return next((msg for msg in reversed(history) if msg.role == Role.user), None)
 
     def _extract_text(self, message: Message) -> str:
         """Extract text content from a message."""
@@ -198,15 +226,16 @@ The evaluator will:
             "",
         ]
 
+        append = lines.append
         for result in results.get("results", []):
-            status = "✓" if result.get("passed") else "✗"
-            lines.append(
-                f"- [{status}] {result.get('task_id')}: "
-                f"{result.get('turns', 0)} turns, "
-                f"{result.get('total_time', 0.0):.1f}s"
+            status = "✓" if result.passed else "✗"
+            append(
+                f"- [{status}] {result.task_id}: "
+                f"{result.turns} turns, {result.total_time:.1f}s"
             )
-            if result.get("error"):
-                lines.append(f"  Error: {result['error']}")
+            error = result.error
+            if error:
+                append(f"  Error: {error}")
 
         return "\n".join(lines)
 
@@ -1,9 +1,19 @@
 """A2A messaging utilities for communicating with participant agent."""
 
-import json
 from typing import Any
 
 import httpx
+import orjson
+
+try:
+    import h2  # noqa: F401  # required by httpx for HTTP/2
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_ENVELOPE_TEMPLATE = {"jsonrpc": "2.0", "method": "tasks/send"}
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class A2AMessenger:
@@ -11,88 +21,88 @@ class A2AMessenger:
 
     def __init__(self, participant_url: str):
         self.participant_url = participant_url.rstrip("/")
-        self._client = httpx.AsyncClient(timeout=60.0)
-        self._session_id: str | None = None
+        self._url = f"{self.participant_url}/"
+        # One pooled client shared by every task; HTTP/2 multiplexes concurrent
+        # turns over a single connection when the participant supports it,
+        # otherwise httpx falls back to pooled HTTP/1.1 keep-alive connections.
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0,
+            ),
+        )
+        # Session IDs keyed by task ID so concurrent tasks don't share sessions
+        self._session_ids: dict[str, str] = {}
 
     async def send_task_instruction(self, instruction: dict) -> dict:
         """Send a task instruction to the participant agent."""
-        message = {
-            "jsonrpc": "2.0",
-            "method": "tasks/send",
-            "id": instruction["task_id"],
-            "params": {
-                "message": {
-                    "role": "user",
-                    "parts": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(
-                                {
-                                    "type": "task_instruction",
-                                    "task_id": instruction["task_id"],
-                                    "instruction": instruction["instruction"],
-                                    "context": instruction.get("context", {}),
-                                }
-                            ),
-                        }
-                    ],
-                }
+        task_id = instruction["task_id"]
+        body = self._build_envelope(
+            task_id,
+            {
+                "type": "task_instruction",
+                "task_id": task_id,
+                "instruction": instruction["instruction"],
+                "context": instruction.get("context", {}),
             },
-        }
-
-        if self._session_id:
-            message["params"]["sessionId"] = self._session_id
+        )
 
-        response = await self._send_request(message)
+        response = await self._send_request(task_id, body)
         return self._parse_agent_response(response)
 
     async def send_command_result(self, task_id: str, result: dict) -> dict:
         """Send command execution result to the participant agent."""
-        message = {
-            "jsonrpc": "2.0",
-            "method": "tasks/send",
-            "id": task_id,
-            "params": {
-                "message": {
-                    "role": "user",
-                    "parts": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(
-                                {
-                                    "type": "command_result",
-                                    "task_id": task_id,
-                                    "stdout": result.get("stdout", ""),
-                                    "stderr": result.get("stderr", ""),
-                                    "exit_code": result.get("exit_code", -1),
-                                    "timed_out": result.get("timed_out", False),
-                                }
-                            ),
-                        }
-                    ],
-                },
-                "sessionId": self._session_id,
+        body = self._build_envelope(
+            task_id,
+            {
+                "type": "command_result",
+                "task_id": task_id,
+                "stdout": result.get("stdout", ""),
+                "stderr": result.get("stderr", ""),
+                "exit_code": result.get("exit_code", -1),
+                "timed_out": result.get("timed_out", False),
             },
-        }
+        )
 
-        response = await self._send_request(message)
+        response = await self._send_request(task_id, body)
         return self._parse_agent_response(response)
 
-    async def _send_request(self, message: dict) -> dict:
-        """Send a JSON-RPC request to the participant agent."""
-        url = f"{self.participant_url}/"
+    def _build_envelope(self, task_id: str, payload: dict) -> bytes:
+        """Build the encoded JSON-RPC tasks/send request for a payload.
+
+        The payload travels as JSON inside a text part, which is what the
+        participant's executor reads.
+        """
+        params = {
+            "message": {
+                "role": "user",
+                "parts": [{"type": "text", "text": orjson.dumps(payload).decode()}],
+            }
+        }
+
+        session_id = self._session_ids.get(task_id)
+        if session_id:
+            params["sessionId"] = session_id
+
+        return orjson.dumps({**_ENVELOPE_TEMPLATE, "id": task_id, "params": params})
+
+    async def _send_request(self, task_id: str, body: bytes) -> dict:
+        """Send an encoded JSON-RPC request to the participant agent."""
         response = await self._client.post(
-            url,
-            json=message,
-            headers={"Content-Type": "application/json"},
+            self._url,
+            content=body,
+            headers=_JSON_HEADERS,
         )
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
 
         # Store session ID from response
         if "result" in result and "sessionId" in result["result"]:
-            self._session_id = result["result"]["sessionId"]
+            self._session_ids[task_id] = result["result"]["sessionId"]
 
         return result
 
@@ -110,8 +120,8 @@ class A2AMessenger:
         for part in parts:
             if part.get("type") == "text":
                 try:
-                    return json.loads(part["text"])
-                except json.JSONDecodeError:
+                    return orjson.loads(part["text"])
+                except orjson.JSONDecodeError:
                     # If not JSON, treat as completion message
                     return {"action": "complete", "reasoning": part["text"]}
 
@@ -120,3 +130,9 @@ class A2AMessenger:
     async def close(self):
         """Close the HTTP client."""
         await self._client.aclose()
+
+    async def __aenter__(self) -> "A2AMessenger":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
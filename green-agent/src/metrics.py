@@ -1,20 +1,43 @@
 """Scoring and reporting for TerminalBench evaluation."""
 
+from dataclasses import asdict, dataclass
 from typing import Optional
 
 
+@dataclass(slots=True)
+class TaskResult:
+    """Outcome of evaluating a single task."""
+
+    task_id: str
+    passed: bool
+    reward: float
+    turns: int
+    total_time: float
+    error: Optional[str] = None
+
+
 class MetricsCollector:
     """Collects and aggregates evaluation metrics."""
 
     def __init__(self):
-        self._results: list[dict] = []
+        self._results: list[TaskResult] = []
         self._total_tasks: int = 0
         self._dataset: str = ""
 
+        # Running aggregates, updated as results are recorded
+        self._passed: int = 0
+        self._total_turns: int = 0
+        self._total_time: float = 0.0
+        self._total_reward: float = 0.0
+
     def reset(self):
         """Reset all metrics."""
         self._results = []
         self._total_tasks = 0
+        self._passed = 0
+        self._total_turns = 0
+        self._total_time = 0.0
+        self._total_reward = 0.0
 
     def set_dataset(self, dataset: str):
         """Set the dataset name."""
@@ -24,12 +47,18 @@ class MetricsCollector:
         """Set the total number of tasks."""
         self._total_tasks = total
 
-    def record_result(self, result: dict):
+    def record_result(self, result: TaskResult):
         """Record a single task result."""
         self._results.append(result)
 
+        if result.passed:
+            self._passed += 1
+        self._total_turns += result.turns
+        self._total_time += result.total_time
+        self._total_reward += result.reward
+
     def get_results(self) -> dict:
-        """Get aggregated results."""
+        """Get aggregated results, with per-task TaskResult objects."""
         if not self._results:
             return {
                 "dataset": self._dataset,
@@ -43,22 +72,17 @@ class MetricsCollector:
                 "results": [],
             }
 
-        passed = sum(1 for r in self._results if r.get("passed", False))
-        failed = len(self._results) - passed
-
-        total_turns = sum(r.get("turns", 0) for r in self._results)
-        total_time = sum(r.get("total_time", 0) for r in self._results)
-        total_reward = sum(r.get("reward", 0) for r in self._results)
+        count = len(self._results)
 
         return {
             "dataset": self._dataset,
-            "total_tasks": len(self._results),
-            "passed": passed,
-            "failed": failed,
-            "pass_rate": passed / len(self._results) if self._results else 0.0,
-            "avg_turns": total_turns / len(self._results) if self._results else 0.0,
-            "avg_time": total_time / len(self._results) if self._results else 0.0,
-            "total_reward": total_reward,
+            "total_tasks": count,
+            "passed": self._passed,
+            "failed": count - self._passed,
+            "pass_rate": self._passed / count,
+            "avg_turns": self._total_turns / count,
+            "avg_time": self._total_time / count,
+            "total_reward": self._total_reward,
             "results": self._results,
         }
 
@@ -85,11 +109,13 @@ class MetricsCollector:
 
     def export_json(self) -> dict:
         """Export results as JSON-serializable dict."""
-        return self.get_results()
+        results = self.get_results()
+        results["results"] = [asdict(r) for r in self._results]
+        return results
 
-    def get_task_result(self, task_id: str) -> Optional[dict]:
+    def get_task_result(self, task_id: str) -> Optional[TaskResult]:
         """Get result for a specific task."""
         for result in self._results:
-            if result.get("task_id") == task_id:
+            if result.task_id == task_id:
                 return result
         return None
@@ -1,20 +1,105 @@
 """Docker container management for task sandboxes."""
 
 import asyncio
-from typing import Optional
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
 
 import docker
-from docker.models.containers import Container
 
+from .docker_api import STDERR_STREAM, STDOUT_STREAM, DockerAPI
 from .task_loader import TerminalBenchTask
 
+# Default timeout for each setup command, summed when they run as one exec
+SETUP_COMMAND_TIMEOUT = 30
+
+# Per-stream cap on captured command output
+MAX_OUTPUT_BYTES = 1024 * 1024
+TRUNCATION_MARKER = "\n...[truncated]"
+
+# Extra time given to the exec stream before the asyncio timeout fires, so the
+# in-container timeout and per-chunk deadline check get to finish first
+TIMEOUT_GRACE = 1.0
+
+# Runs "$0" (the command) under timeout so the process is terminated inside the
+# container, then SIGKILLed after "$2" more seconds if it ignores SIGTERM.
+# Images whose timeout lacks -k (no binary, older BusyBox, the old -t syntax)
+# fail the probe and run the command directly, relying on the host deadline.
+_TIMEOUT_WRAPPER = (
+    'if timeout -k 1 1 true >/dev/null 2>&1; then '
+    'exec timeout -k "$2" "$1" /bin/sh -c "$0"; fi; '
+    'exec /bin/sh -c "$0"'
+)
+KILL_AFTER = 5
+
+# Exit statuses timeout reports when the command timed out: 124 from coreutils,
+# 128 + SIGTERM from BusyBox, 128 + SIGKILL once the -k grace period ran out
+TIMEOUT_EXIT_CODES = frozenset({124, 143, 137})
+
+
+def _append_capped(buffer: bytearray, chunk: bytes) -> bool:
+    """Append chunk to buffer up to MAX_OUTPUT_BYTES; return True if truncated."""
+    room = MAX_OUTPUT_BYTES - len(buffer)
+    if room > 0:
+        buffer += chunk[:room]
+    return len(chunk) > room
+
+
+@dataclass(slots=True)
+class _ExecOutput:
+    """Capped output collected from an exec stream so far."""
+
+    stdout: bytearray = field(default_factory=bytearray)
+    stderr: bytearray = field(default_factory=bytearray)
+    stdout_truncated: bool = False
+    stderr_truncated: bool = False
+
+    def append(self, stream: int, chunk: bytes) -> None:
+        if stream == STDOUT_STREAM:
+            self.stdout_truncated |= _append_capped(self.stdout, chunk)
+        elif stream == STDERR_STREAM:
+            self.stderr_truncated |= _append_capped(self.stderr, chunk)
+
+    def decode(self) -> tuple[str, str]:
+        """Return (stdout, stderr) text, marking truncated streams."""
+        stdout_text = self.stdout.decode("utf-8", errors="replace")
+        stderr_text = self.stderr.decode("utf-8", errors="replace")
+        if self.stdout_truncated:
+            stdout_text += TRUNCATION_MARKER
+        if self.stderr_truncated:
+            stderr_text += TRUNCATION_MARKER
+        return stdout_text, stderr_text
+
 
 class SandboxManager:
     """Manages Docker containers for isolated task execution."""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 0):
+        self._api = DockerAPI()
+        # docker-py client is only used for image pulls
         self._client: Optional[docker.DockerClient] = None
-        self._containers: dict[str, Container] = {}
+        # Active sandbox IDs. Each task coroutine only adds and removes its own
+        # ID, so concurrent tasks never collide and no lock is needed;
+        # iteration always works on a snapshot.
+        self._sandboxes: set[str] = set()
+        # Image -> task ensuring it is present locally. Concurrent sandboxes for
+        # the same image share one pull, and once done the check is free.
+        self._image_pulls: dict[str, asyncio.Task] = {}
+
+        # Warm pool of started, never-used containers keyed by
+        # (image, working directory). Used containers are always destroyed
+        # rather than recycled so one task's changes can't leak into another.
+        self.pool_size = pool_size
+        self._pool: dict[tuple[str, str], asyncio.Queue[str]] = {}
+        self._pool_pending: dict[tuple[str, str], int] = {}
+        self._refills: set[asyncio.Task] = set()
+        # Containers a refill has created but not yet queued, so cleanup can
+        # still remove them if the refill is cancelled mid-start
+        self._pool_starting: set[str] = set()
+        # Pooled sandboxes still to be requested per pool key, when known; the
+        # pool is never filled beyond what remaining tasks can use
+        self._pool_demand: dict[tuple[str, str], int] = {}
 
     def _get_client(self) -> docker.DockerClient:
         """Get or create Docker client."""
@@ -24,39 +109,145 @@ class SandboxManager:
 
     async def create_sandbox(self, task: TerminalBenchTask) -> str:
         """Create a Docker sandbox for a task."""
-        client = self._get_client()
+        container_id = None
+
+        # Tasks with environment overrides need a container configured for them
+        pool_key = None
+        if self.pool_size > 0 and not task.environment:
+            pool_key = (task.docker_image, task.working_directory)
+            if pool_key in self._pool_demand:
+                self._pool_demand[pool_key] -= 1
+            container_id = self._take_pooled(pool_key)
+            if self._pool_target(pool_key) > 0:
+                self._schedule_refill(pool_key)
+
+        if container_id is None:
+            container_id = await self._start_container(
+                task.docker_image, task.working_directory, task.environment
+            )
+
+        # Run setup commands as a single script in one exec
+        if task.setup_commands:
+            await self.execute_command(
+                container_id,
+                "\n".join(task.setup_commands),
+                timeout=SETUP_COMMAND_TIMEOUT * len(task.setup_commands),
+            )
+
+        self._sandboxes.add(container_id)
+        return container_id
 
+    async def _start_container(
+        self,
+        image: str,
+        working_directory: str,
+        environment: dict,
+        track: Optional[set[str]] = None,
+    ) -> str:
+        """Create and start a sandbox container, pulling the image if needed.
+
+        If given, track receives the container ID as soon as it exists.
+        """
         # Pull image if needed
+        pull = self._image_pull(image)
         try:
-            client.images.get(task.docker_image)
-        except docker.errors.ImageNotFound:
-            await asyncio.to_thread(client.images.pull, task.docker_image)
+            await asyncio.shield(pull)
+        except Exception:
+            # Let the next sandbox retry a failed pull
+            if self._image_pulls.get(image) is pull:
+                del self._image_pulls[image]
+            raise
 
         # Create container
-        container = await asyncio.to_thread(
-            client.containers.create,
-            image=task.docker_image,
-            command="sleep infinity",
-            working_dir=task.working_directory,
-            environment=task.environment,
-            detach=True,
-            tty=True,
-            stdin_open=True,
-            network_mode="none",  # Isolated network
-            mem_limit="512m",
-            cpu_period=100000,
-            cpu_quota=50000,  # 50% CPU limit
+        container_id = await self._api.create_container(
+            {
+                "Image": image,
+                "Cmd": ["sleep", "infinity"],
+                "WorkingDir": working_directory,
+                "Env": [f"{key}={value}" for key, value in environment.items()],
+                "Tty": True,
+                "OpenStdin": True,
+                "HostConfig": {
+                    "NetworkMode": "none",  # Isolated network
+                    "Memory": 512 * 1024 * 1024,
+                    "CpuPeriod": 100000,
+                    "CpuQuota": 50000,  # 50% CPU limit
+                },
+            }
         )
 
+        if track is not None:
+            track.add(container_id)
+
         # Start container
-        await asyncio.to_thread(container.start)
+        await self._api.start_container(container_id)
+        return container_id
 
-        # Run setup commands
-        for cmd in task.setup_commands:
-            await self.execute_command(container.id, cmd)
+    def prefetch_images(self, images: Iterable[str]) -> None:
+        """Start pulling images in the background ahead of sandbox creation."""
+        for image in images:
+            self._image_pull(image)
 
-        self._containers[container.id] = container
-        return container.id
+    def _image_pull(self, image: str) -> asyncio.Task:
+        """Get the task ensuring an image is present, starting it if needed."""
+        pull = self._image_pulls.get(image)
+        if pull is None:
+            pull = asyncio.create_task(self._ensure_image(image))
+            self._image_pulls[image] = pull
+        return pull
+
+    async def _ensure_image(self, image: str) -> None:
+        """Pull an image unless it is already present locally."""
+        if not await self._api.image_exists(image):
+            client = self._get_client()
+            await asyncio.to_thread(client.images.pull, image)
+
+    def expect_sandboxes(self, tasks: Iterable[TerminalBenchTask]) -> None:
+        """Record the sandboxes upcoming tasks will request, to bound the pool."""
+        self._pool_demand.clear()
+        for task in tasks:
+            if not task.environment:
+                pool_key = (task.docker_image, task.working_directory)
+                self._pool_demand[pool_key] = self._pool_demand.get(pool_key, 0) + 1
+
+    def _pool_target(self, pool_key: tuple[str, str]) -> int:
+        """Number of warm containers worth keeping for a pool key."""
+        return min(self.pool_size, self._pool_demand.get(pool_key, self.pool_size))
+
+    def _take_pooled(self, pool_key: tuple[str, str]) -> Optional[str]:
+        """Take a warm container from the pool, if one is ready."""
+        queue = self._pool.setdefault(pool_key, asyncio.Queue())
+        try:
+            return queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def _schedule_refill(self, pool_key: tuple[str, str]) -> None:
+        """Top the pool back up to pool_size in the background."""
+        refill = asyncio.create_task(self._refill_pool(pool_key))
+        self._refills.add(refill)
+        refill.add_done_callback(self._refills.discard)
+
+    async def _refill_pool(self, pool_key: tuple[str, str]) -> None:
+        """Start containers until the pool (plus in-flight starts) is full."""
+        queue = self._pool[pool_key]
+        image, working_directory = pool_key
+
+        while queue.qsize() + self._pool_pending.get(pool_key, 0) < self._pool_target(
+            pool_key
+        ):
+            self._pool_pending[pool_key] = self._pool_pending.get(pool_key, 0) + 1
+            try:
+                container_id = await self._start_container(
+                    image, working_directory, {}, track=self._pool_starting
+                )
+            except Exception:
+                # Tasks fall back to cold starts
+                return
+            finally:
+                self._pool_pending[pool_key] -= 1
+            self._pool_starting.discard(container_id)
+            queue.put_nowait(container_id)
 
     async def execute_command(
         self,
@@ -66,10 +257,15 @@ class SandboxManager:
         workdir: Optional[str] = None,
     ) -> dict:
         """Execute a command in the sandbox."""
-        client = self._get_client()
-
+        # Owned here so output survives the asyncio timeout cancelling the stream
+        output = _ExecOutput()
         try:
-            container = client.containers.get(sandbox_id)
+            # Execute with timeout
+            return await asyncio.wait_for(
+                self._stream_exec(sandbox_id, command, timeout, workdir, output),
+                timeout=timeout + TIMEOUT_GRACE,
+            )
+
         except docker.errors.NotFound:
             return {
                 "stdout": "",
@@ -77,38 +273,11 @@ class SandboxManager:
                 "exit_code": -1,
                 "timed_out": False,
             }
-
-        exec_kwargs = {
-            "cmd": ["/bin/sh", "-c", command],
-            "stdout": True,
-            "stderr": True,
-            "demux": True,
-        }
-
-        if workdir:
-            exec_kwargs["workdir"] = workdir
-
-        try:
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                asyncio.to_thread(container.exec_run, **exec_kwargs),
-                timeout=timeout,
-            )
-
-            stdout = result.output[0] if result.output[0] else b""
-            stderr = result.output[1] if result.output[1] else b""
-
-            return {
-                "stdout": stdout.decode("utf-8", errors="replace"),
-                "stderr": stderr.decode("utf-8", errors="replace"),
-                "exit_code": result.exit_code,
-                "timed_out": False,
-            }
-
         except asyncio.TimeoutError:
+            stdout_text, stderr_text = output.decode()
             return {
-                "stdout": "",
-                "stderr": f"Command timed out after {timeout}s",
+                "stdout": stdout_text,
+                "stderr": stderr_text + f"\nCommand timed out after {timeout}s",
                 "exit_code": -1,
                 "timed_out": True,
             }
@@ -120,27 +289,91 @@ class SandboxManager:
                 "timed_out": False,
             }
 
+    async def _stream_exec(
+        self,
+        sandbox_id: str,
+        command: str,
+        timeout: int,
+        workdir: Optional[str],
+        output: _ExecOutput,
+    ) -> dict:
+        """Run a command via the exec API, streaming capped output into output."""
+        exec_id = await self._api.exec_create(
+            sandbox_id,
+            ["/bin/sh", "-c", _TIMEOUT_WRAPPER, command, str(timeout), str(KILL_AFTER)],
+            workdir=workdir,
+        )
+
+        timed_out = False
+        deadline = time.monotonic() + timeout
+
+        async with aclosing(self._api.exec_stream(exec_id)) as frames:
+            async for stream, chunk in frames:
+                output.append(stream, chunk)
+                if time.monotonic() > deadline:
+                    timed_out = True
+                    break
+
+        stdout_text, stderr_text = output.decode()
+
+        if not timed_out:
+            exit_code = (await self._api.exec_inspect(exec_id))["ExitCode"]
+            # Only the wrapper's own timeout, not the same status from the
+            # user's command finishing early
+            timed_out = (
+                exit_code in TIMEOUT_EXIT_CODES and time.monotonic() >= deadline
+            )
+
+        if timed_out:
+            return {
+                "stdout": stdout_text,
+                "stderr": stderr_text + f"\nCommand timed out after {timeout}s",
+                "exit_code": -1,
+                "timed_out": True,
+            }
+
+        return {
+            "stdout": stdout_text,
+            "stderr": stderr_text,
+            "exit_code": exit_code,
+            "timed_out": False,
+        }
+
     async def cleanup_sandbox(self, sandbox_id: str) -> None:
         """Remove a sandbox container."""
-        client = self._get_client()
-
         try:
-            container = client.containers.get(sandbox_id)
-            await asyncio.to_thread(container.stop, timeout=5)
-            await asyncio.to_thread(container.remove, force=True)
+            await self._api.stop_container(sandbox_id, timeout=5)
+            await self._api.remove_container(sandbox_id, force=True)
         except docker.errors.NotFound:
             pass
         except Exception:
             # Force remove on any error
             try:
-                container = client.containers.get(sandbox_id)
-                await asyncio.to_thread(container.remove, force=True)
+                await self._api.remove_container(sandbox_id, force=True)
             except Exception:
                 pass
 
-        self._containers.pop(sandbox_id, None)
+        self._sandboxes.discard(sandbox_id)
 
     async def cleanup_all(self) -> None:
-        """Remove all sandbox containers."""
-        for sandbox_id in list(self._containers.keys()):
-            await self.cleanup_sandbox(sandbox_id)
+        """Remove all sandbox containers, including warm pooled ones."""
+        for refill in list(self._refills):
+            refill.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+
+        sandbox_ids = [*self._sandboxes, *self._pool_starting]
+        self._pool_starting.clear()
+        for queue in self._pool.values():
+            while not queue.empty():
+                sandbox_ids.append(queue.get_nowait())
+
+        await asyncio.gather(
+            *(self.cleanup_sandbox(sandbox_id) for sandbox_id in sandbox_ids)
+        )
+
+    async def close(self) -> None:
+        """Close the Docker API session and the docker-py client."""
+        await self._api.close()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
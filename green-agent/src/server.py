@@ -14,6 +14,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.executor import GreenAgentExecutor
 
+try:
+    import uvloop  # noqa: F401
+
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    # uvloop is unavailable on Windows
+    EVENT_LOOP = "asyncio"
+
 
 def create_agent_card(host: str, port: int) -> AgentCard:
     """Create the agent card for the green agent."""
@@ -53,6 +61,18 @@ def main():
         default="http://127.0.0.1:9010",
         help="Participant agent URL",
     )
+    parser.add_argument(
+        "--max-concurrent-tasks",
+        type=int,
+        default=4,
+        help="Max tasks evaluated concurrently",
+    )
+    parser.add_argument(
+        "--sandbox-pool-size",
+        type=int,
+        default=2,
+        help="Warm sandbox containers kept ready per image (0 disables)",
+    )
     args = parser.parse_args()
 
     agent_card = create_agent_card(args.host, args.port)
@@ -62,6 +82,8 @@ def main():
         max_turns=args.max_turns,
         task_timeout=args.task_timeout,
         participant_url=args.participant_url,
+        max_concurrent_tasks=args.max_concurrent_tasks,
+        sandbox_pool_size=args.sandbox_pool_size,
     )
 
     request_handler = DefaultRequestHandler(
@@ -75,7 +97,13 @@ def main():
     )
 
     print(f"Starting TerminalBench Evaluator on {args.host}:{args.port}")
-    uvicorn.run(app.build(), host=args.host, port=args.port)
+    uvicorn.run(
+        app.build(),
+        host=args.host,
+        port=args.port,
+        loop=EVENT_LOOP,
+        http="httptools",
+    )
 
 
 if __name__ == "__main__":
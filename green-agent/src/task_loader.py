@@ -1,10 +1,11 @@
 """TerminalBench task loading via Harbor framework."""
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TerminalBenchTask:
     """Represents a single TerminalBench task."""
 
@@ -16,11 +17,45 @@ class TerminalBenchTask:
     docker_image: str
     setup_commands: list[str]
     expected_reward: float = 1.0
-    tags: list[str] = None
+    tags: list[str] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.tags is None:
-            self.tags = []
+
+# Sample tasks for testing when Harbor is not available
+_SAMPLE_TASKS: tuple[TerminalBenchTask, ...] = (
+    TerminalBenchTask(
+        task_id="sample-001",
+        instruction="Create a file named 'hello.txt' containing the text 'Hello, World!'",
+        working_directory="/workspace",
+        environment={},
+        test_script='test -f /workspace/hello.txt && grep -q "Hello, World!" /workspace/hello.txt',
+        docker_image="ubuntu:22.04",
+        setup_commands=[],
+        tags=["file-operations", "basic"],
+    ),
+    TerminalBenchTask(
+        task_id="sample-002",
+        instruction="Create a directory named 'mydir' and inside it create a file named 'data.json' with valid JSON content: {\"key\": \"value\"}",
+        working_directory="/workspace",
+        environment={},
+        test_script='test -d /workspace/mydir && test -f /workspace/mydir/data.json && python3 -c "import json; json.load(open(\'/workspace/mydir/data.json\'))"',
+        docker_image="python:3.11-slim",
+        setup_commands=[],
+        tags=["file-operations", "json"],
+    ),
+    TerminalBenchTask(
+        task_id="sample-003",
+        instruction="Find all .txt files in /workspace and count how many there are. Write the count to a file called 'count.txt'",
+        working_directory="/workspace",
+        environment={},
+        test_script="test -f /workspace/count.txt",
+        docker_image="ubuntu:22.04",
+        setup_commands=[
+            "mkdir -p /workspace/subdir",
+            "touch /workspace/a.txt /workspace/b.txt /workspace/subdir/c.txt",
+        ],
+        tags=["file-operations", "find"],
+    ),
+)
 
 
 class TaskLoader:
@@ -29,6 +64,7 @@ class TaskLoader:
     def __init__(self, dataset: str):
         self.dataset = dataset
         self._tasks: list[TerminalBenchTask] = []
+        self._task_index: dict[str, TerminalBenchTask] = {}
 
     async def load_tasks(self) -> list[TerminalBenchTask]:
         """Load tasks from the TerminalBench dataset."""
@@ -36,14 +72,25 @@ class TaskLoader:
             # Try to load via Harbor
             from harbor import load_dataset
 
-            dataset = load_dataset(self.dataset)
-            self._tasks = [self._convert_task(t) for t in dataset.tasks]
+            # Harbor is synchronous; keep its dataset and per-task accessor
+            # I/O off the event loop and convert tasks concurrently
+            dataset = await asyncio.to_thread(load_dataset, self.dataset)
+            self._tasks = list(
+                await asyncio.gather(
+                    *(self._convert_task_async(t) for t in dataset.tasks)
+                )
+            )
         except ImportError:
             # Harbor not available, use sample tasks for testing
             self._tasks = self._get_sample_tasks()
 
+        self._task_index = {t.task_id: t for t in self._tasks}
         return self._tasks
 
+    async def _convert_task_async(self, harbor_task) -> TerminalBenchTask:
+        """Convert a Harbor task in a worker thread."""
+        return await asyncio.to_thread(self._convert_task, harbor_task)
+
     def _convert_task(self, harbor_task) -> TerminalBenchTask:
         """Convert a Harbor task to our internal format."""
         return TerminalBenchTask(
@@ -60,45 +107,8 @@ class TaskLoader:
 
     def _get_sample_tasks(self) -> list[TerminalBenchTask]:
         """Get sample tasks for testing when Harbor is not available."""
-        return [
-            TerminalBenchTask(
-                task_id="sample-001",
-                instruction="Create a file named 'hello.txt' containing the text 'Hello, World!'",
-                working_directory="/workspace",
-                environment={},
-                test_script='test -f /workspace/hello.txt && grep -q "Hello, World!" /workspace/hello.txt',
-                docker_image="ubuntu:22.04",
-                setup_commands=[],
-                tags=["file-operations", "basic"],
-            ),
-            TerminalBenchTask(
-                task_id="sample-002",
-                instruction="Create a directory named 'mydir' and inside it create a file named 'data.json' with valid JSON content: {\"key\": \"value\"}",
-                working_directory="/workspace",
-                environment={},
-                test_script='test -d /workspace/mydir && test -f /workspace/mydir/data.json && python3 -c "import json; json.load(open(\'/workspace/mydir/data.json\'))"',
-                docker_image="python:3.11-slim",
-                setup_commands=[],
-                tags=["file-operations", "json"],
-            ),
-            TerminalBenchTask(
-                task_id="sample-003",
-                instruction="Find all .txt files in /workspace and count how many there are. Write the count to a file called 'count.txt'",
-                working_directory="/workspace",
-                environment={},
-                test_script="test -f /workspace/count.txt",
-                docker_image="ubuntu:22.04",
-                setup_commands=[
-                    "mkdir -p /workspace/subdir",
-                    "touch /workspace/a.txt /workspace/b.txt /workspace/subdir/c.txt",
-                ],
-                tags=["file-operations", "find"],
-            ),
-        ]
+        return list(_SAMPLE_TASKS)
 
     def get_task_by_id(self, task_id: str) -> Optional[TerminalBenchTask]:
         """Get a specific task by ID."""
-        for task in self._tasks:
-            if task.task_id == task_id:
-                return task
-        return None
+        return self._task_index.get(task_id)
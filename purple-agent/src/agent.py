@@ -1,10 +1,39 @@
 """Core terminal agent logic."""
 
+import asyncio
+from collections import deque
 from typing import Optional
 
 from .llm_client import LLMClient
+from .messenger import CommandResult
 from .planner import TaskPlanner
 
+# Result assumed when planning ahead: a clean, silent success, which is what
+# most file-creating and setup commands produce
+_PREDICTED_RESULT = CommandResult(exit_code=0)
+
+# Only the tail of long command output is sent to the LLM
+_MAX_OUTPUT_BYTES = 8192
+_TRUNCATED = "...[truncated]...\n"
+
+
+def _clip_output(output: str) -> str:
+    """Strip command output, keeping only its last _MAX_OUTPUT_BYTES characters."""
+    if not output:
+        return ""
+    if len(output) > _MAX_OUTPUT_BYTES:
+        output = output[-_MAX_OUTPUT_BYTES:].strip()
+        return _TRUNCATED + output if output else ""
+    return output.strip()
+
+
+_SUMMARY_PROMPT = (
+    "You summarize the progress of a terminal agent working on a task. Given the "
+    "earlier summary (if any) and the turns that follow it, write a short summary "
+    "of the commands run, what they showed, and what remains to be done. Keep file "
+    "paths, error messages and other details needed to continue the task."
+)
+
 
 class TerminalAgent:
     """LLM-powered agent that executes terminal tasks."""
@@ -16,6 +45,12 @@ class TerminalAgent:
         temperature: float = 0.0,
         api_key: str | None = None,
         api_base: str | None = None,
+        history_window: int = 40,
+        speculative_planning: bool = False,
+        sync_completion: bool = False,
+        summarize_history: bool = False,
+        cache_dir: str | None = None,
+        stream_planning: bool = False,
     ):
         self.llm_client = LLMClient(
             model=model,
@@ -23,13 +58,32 @@ class TerminalAgent:
             temperature=temperature,
             api_key=api_key,
             api_base=api_base,
+            sync_completion=sync_completion,
+            cache_dir=cache_dir,
         )
-        self.planner = TaskPlanner(self.llm_client)
+        self.planner = TaskPlanner(self.llm_client, streaming=stream_planning)
 
-        # Conversation history per task
-        self._task_histories: dict[str, list[dict]] = {}
+        # Conversation history per task. The initial task message is kept
+        # separately and always sent first; only the most recent turns after
+        # it are retained. The window is kept even so the retained turns
+        # always start with an assistant message and roles keep alternating.
+        self.history_window = history_window + history_window % 2
+        self._task_prompts: dict[str, dict] = {}
+        self._task_histories: dict[str, deque[dict]] = {}
         self._task_contexts: dict[str, dict] = {}
 
+        # Optionally fold the oldest half of a full window into a running
+        # summary appended to the task message, instead of dropping it
+        self.summarize_history = summarize_history
+        self._task_summaries: dict[str, str] = {}
+
+        # Optionally plan the next action while the green agent is still
+        # executing the current command, assuming it succeeds silently. Maps
+        # task ID to (predicted result message, planning task).
+        self.speculative_planning = speculative_planning
+        self._pending: dict[str, tuple[str, asyncio.Task]] = {}
+        self._predicted_message = self._format_result_message(_PREDICTED_RESULT)
+
     async def start_task(
         self,
         task_id: str,
@@ -38,25 +92,20 @@ class TerminalAgent:
     ) -> dict:
         """Start a new task and return the first action."""
         # Initialize conversation history for this task
-        self._task_histories[task_id] = []
+        self._task_histories[task_id] = deque(maxlen=self.history_window)
         self._task_contexts[task_id] = {
             "instruction": instruction,
             "working_directory": context.get("working_directory", "/workspace"),
             "environment": context.get("environment", {}),
         }
 
-        # Add the initial instruction to history
-        self._task_histories[task_id].append(
-            {
-                "role": "user",
-                "content": f"Task: {instruction}\n\nWorking directory: {context.get('working_directory', '/workspace')}",
-            }
-        )
+        # The initial instruction leads every conversation sent to the LLM
+        self._task_prompts[task_id] = self._build_prompt(self._task_contexts[task_id])
 
         # Generate first command
         response = await self.planner.plan_next_action(
             instruction=instruction,
-            history=self._task_histories[task_id],
+            history=self._get_conversation(task_id),
             context=self._task_contexts[task_id],
         )
 
@@ -68,12 +117,13 @@ class TerminalAgent:
             }
         )
 
+        self._speculate(task_id, response)
         return response
 
     async def process_result(
         self,
         task_id: str,
-        result: dict,
+        result: CommandResult,
     ) -> dict:
         """Process command result and return next action."""
         if task_id not in self._task_histories:
@@ -85,6 +135,10 @@ class TerminalAgent:
         # Format the result message
         result_message = self._format_result_message(result)
 
+        # Make room for this turn by summarizing the oldest ones
+        if self._needs_summary(task_id):
+            await self._summarize_history(task_id)
+
         # Add result to history
         self._task_histories[task_id].append(
             {
@@ -97,12 +151,15 @@ class TerminalAgent:
         context = self._task_contexts.get(task_id, {})
         instruction = context.get("instruction", "")
 
-        # Generate next action
-        response = await self.planner.plan_next_action(
-            instruction=instruction,
-            history=self._task_histories[task_id],
-            context=context,
-        )
+        # Generate next action, reusing the speculative plan if it was made
+        # for exactly this result
+        response = await self._take_speculation(task_id, result_message)
+        if response is None:
+            response = await self.planner.plan_next_action(
+                instruction=instruction,
+                history=self._get_conversation(task_id),
+                context=context,
+            )
 
         # Add response to history
         self._task_histories[task_id].append(
@@ -112,26 +169,117 @@ class TerminalAgent:
             }
         )
 
+        self._speculate(task_id, response)
         return response
 
-    def _format_result_message(self, result: dict) -> str:
-        """Format command result as a message for the conversation."""
-        parts = ["Command execution result:"]
+    def _speculate(self, task_id: str, response: dict) -> None:
+        """Start planning the action after a command, assuming it succeeds."""
+        if not self.speculative_planning or response.get("action") != "execute":
+            return
 
-        if result.get("timed_out"):
-            parts.append("⚠️ Command timed out")
+        # The next result triggers a summary, which changes the conversation
+        if self._needs_summary(task_id):
+            return
 
-        parts.append(f"Exit code: {result.get('exit_code', -1)}")
+        # The exact conversation process_result would send for that result
+        history = self._task_histories[task_id]
+        window = deque(history, maxlen=history.maxlen)
+        window.append({"role": "user", "content": self._predicted_message})
+        context = self._task_contexts[task_id]
 
-        stdout = result.get("stdout", "").strip()
-        if stdout:
-            parts.append(f"stdout:\n```\n{stdout}\n```")
+        planning = asyncio.create_task(
+            self.planner.plan_next_action(
+                instruction=context["instruction"],
+                history=[self._task_prompts[task_id], *window],
+                context=context,
+            )
+        )
+        # Mark failures as retrieved; a failed speculation is just discarded
+        planning.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._pending[task_id] = (self._predicted_message, planning)
+
+    async def _take_speculation(
+        self, task_id: str, result_message: str
+    ) -> Optional[dict]:
+        """Return the speculative plan if it matches the actual result."""
+        pending = self._pending.pop(task_id, None)
+        if pending is None:
+            return None
+
+        predicted_message, planning = pending
+        if predicted_message != result_message:
+            planning.cancel()
+            return None
+
+        try:
+            return await planning
+        except Exception:
+            return None
+
+    @staticmethod
+    def _build_prompt(context: dict, summary: str = "") -> dict:
+        """Build the task message, with the summary of earlier turns if any."""
+        content = (
+            f"Task: {context['instruction']}\n\n"
+            f"Working directory: {context['working_directory']}"
+        )
+        if summary:
+            content += f"\n\nSummary of earlier steps:\n{summary}"
+        return {"role": "user", "content": content}
+
+    def _needs_summary(self, task_id: str) -> bool:
+        """Check whether the next result/response pair would overflow the window."""
+        return (
+            self.summarize_history
+            and len(self._task_histories[task_id]) + 2 > self.history_window
+        )
+
+    async def _summarize_history(self, task_id: str) -> None:
+        """Replace the oldest half of the window with a running summary."""
+        history = self._task_histories[task_id]
+        # Drop an even number of turns so the history still starts with an
+        # assistant message
+        count = min(len(history), max(2, self.history_window // 4 * 2))
+        old_turns = [history.popleft() for _ in range(count)]
 
-        stderr = result.get("stderr", "").strip()
-        if stderr:
-            parts.append(f"stderr:\n```\n{stderr}\n```")
+        previous = self._task_summaries.get(task_id, "")
+        transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in old_turns)
+        if previous:
+            transcript = f"Earlier summary:\n{previous}\n\n{transcript}"
 
-        return "\n\n".join(parts)
+        try:
+            summary = await self.llm_client.complete(
+                [{"role": "user", "content": transcript}],
+                system_prompt=_SUMMARY_PROMPT,
+            )
+        except Exception:
+            # Keep the previous summary; the turns are dropped as they would
+            # be by the window alone
+            return
+
+        if task_id not in self._task_histories:
+            return  # Task was cleared while summarizing
+        self._task_summaries[task_id] = summary
+        self._task_prompts[task_id] = self._build_prompt(
+            self._task_contexts[task_id], summary
+        )
+
+    def _get_conversation(self, task_id: str) -> list[dict]:
+        """Get the messages to send: the task message plus recent turns."""
+        return [self._task_prompts[task_id], *self._task_histories[task_id]]
+
+    def _format_result_message(self, result: CommandResult) -> str:
+        """Format command result as a message for the conversation."""
+        stdout = _clip_output(result.stdout)
+        stderr = _clip_output(result.stderr)
+
+        return (
+            "Command execution result:\n\n"
+            + ("⚠️ Command timed out\n\n" if result.timed_out else "")
+            + f"Exit code: {result.exit_code}"
+            + (f"\n\nstdout:\n```\n{stdout}\n```" if stdout else "")
+            + (f"\n\nstderr:\n```\n{stderr}\n```" if stderr else "")
+        )
 
     def _format_response_for_history(self, response: dict) -> str:
         """Format agent response for conversation history."""
@@ -145,5 +293,10 @@ class TerminalAgent:
 
     def clear_task(self, task_id: str) -> None:
         """Clear history for a completed task."""
+        pending = self._pending.pop(task_id, None)
+        if pending is not None:
+            pending[1].cancel()
+        self._task_prompts.pop(task_id, None)
+        self._task_summaries.pop(task_id, None)
         self._task_histories.pop(task_id, None)
         self._task_contexts.pop(task_id, None)
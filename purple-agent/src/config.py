@@ -0,0 +1,20 @@
+"""Configuration for the purple agent."""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class AgentConfig:
+    """Agent settings, fixed for the lifetime of the server."""
+
+    model: str
+    max_tokens: int = 4096
+    temperature: float = 0.0
+    api_key: str | None = None
+    api_base: str | None = None
+    history_window: int = 40
+    speculative_planning: bool = False
+    sync_completion: bool = False
+    summarize_history: bool = False
+    cache_dir: str | None = None
+    stream_planning: bool = False
@@ -1,9 +1,9 @@
 """A2A request handler for the purple agent."""
 
 import asyncio
-import json
 from typing import AsyncIterable
 
+import msgspec
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import Event
 from a2a.types import (
@@ -17,25 +17,32 @@ from a2a.types import (
 )
 
 from .agent import TerminalAgent
+from .config import AgentConfig
+from .messenger import (
+    REQUEST_DECODER,
+    CommandResult,
+    MessageFormatter,
+    TaskInstruction,
+)
 
 
 class PurpleAgentExecutor(AgentExecutor):
     """Executor that handles A2A requests for the purple agent."""
 
-    def __init__(
-        self,
-        model: str,
-        max_tokens: int = 4096,
-        temperature: float = 0.0,
-        api_key: str | None = None,
-        api_base: str | None = None,
-    ):
+    def __init__(self, config: AgentConfig):
+        self.config = config
         self.agent = TerminalAgent(
-            model=model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            api_key=api_key,
-            api_base=api_base,
+            model=config.model,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            api_key=config.api_key,
+            api_base=config.api_base,
+            history_window=config.history_window,
+            speculative_planning=config.speculative_planning,
+            sync_completion=config.sync_completion,
+            summarize_history=config.summarize_history,
+            cache_dir=config.cache_dir,
+            stream_planning=config.stream_planning,
         )
 
     async def execute(
@@ -57,19 +64,16 @@ class PurpleAgentExecutor(AgentExecutor):
         request_text = self._extract_text(user_message)
 
         try:
-            # Parse the incoming message
-            request_data = json.loads(request_text)
-            message_type = request_data.get("type")
-
-            if message_type == "task_instruction":
-                await self._handle_task_instruction(event_queue, task, request_data)
-            elif message_type == "command_result":
-                await self._handle_command_result(event_queue, task, request_data)
+            # Parse the incoming message, dispatching on its "type" tag
+            request = REQUEST_DECODER.decode(request_text)
+
+            if type(request) is TaskInstruction:
+                await self._handle_task_instruction(event_queue, task, request)
             else:
-                await self._send_error(
-                    event_queue, task, f"Unknown message type: {message_type}"
-                )
-        except json.JSONDecodeError:
+                await self._handle_command_result(event_queue, task, request)
+        except msgspec.ValidationError as e:
+            await self._send_error(event_queue, task, f"Invalid request: {e}")
+        except msgspec.DecodeError:
             await self._send_error(event_queue, task, "Invalid JSON in request")
         except Exception as e:
             await self._send_error(event_queue, task, str(e))
@@ -78,7 +82,7 @@ class PurpleAgentExecutor(AgentExecutor):
         self,
         event_queue: asyncio.Queue[Event],
         task: Task,
-        request_data: dict,
+        request: TaskInstruction,
     ) -> None:
         """Handle a new task instruction from the green agent."""
         # Update task status to working
@@ -90,11 +94,9 @@ class PurpleAgentExecutor(AgentExecutor):
         )
 
         # Initialize new task in agent
-        task_id = request_data.get("task_id", "")
-        instruction = request_data.get("instruction", "")
-        context = request_data.get("context", {})
-
-        response = await self.agent.start_task(task_id, instruction, context)
+        response = await self.agent.start_task(
+            request.task_id, request.instruction, request.context
+        )
 
         # Send response
         await self._send_response(event_queue, task, response)
@@ -103,18 +105,10 @@ class PurpleAgentExecutor(AgentExecutor):
         self,
         event_queue: asyncio.Queue[Event],
         task: Task,
-        request_data: dict,
+        request: CommandResult,
     ) -> None:
         """Handle command execution result from the green agent."""
-        task_id = request_data.get("task_id", "")
-        result = {
-            "stdout": request_data.get("stdout", ""),
-            "stderr": request_data.get("stderr", ""),
-            "exit_code": request_data.get("exit_code", -1),
-            "timed_out": request_data.get("timed_out", False),
-        }
-
-        response = await self.agent.process_result(task_id, result)
+        response = await self.agent.process_result(request.task_id, request)
 
         # Send response
         await self._send_response(event_queue, task, response)
@@ -132,7 +126,7 @@ class PurpleAgentExecutor(AgentExecutor):
                 status=TaskStatus(state=TaskState.completed),
                 artifact=Message(
                     role=Role.agent,
-                    parts=[TextPart(text=json.dumps(response))],
+                    parts=[TextPart(text=MessageFormatter.encode_response(response))],
                 ),
             )
         )
@@ -154,7 +148,7 @@ class PurpleAgentExecutor(AgentExecutor):
                 status=TaskStatus(state=TaskState.failed),
                 artifact=Message(
                     role=Role.agent,
-                    parts=[TextPart(text=json.dumps(response))],
+                    parts=[TextPart(text=MessageFormatter.encode_response(response))],
                 ),
             )
         )
@@ -169,11 +163,8 @@ class PurpleAgentExecutor(AgentExecutor):
 
     def _extract_text(self, message: Message) -> str:
         """Extract text content from a message."""
-        texts = []
-        for part in message.parts:
-            if isinstance(part, TextPart):
-                texts.append(part.text)
-        return " ".join(texts)
+        # Exact class check: TextPart is never subclassed
+        return " ".join(part.text for part in message.parts if part.__class__ is TextPart)
 
     def cancel(self, context: RequestContext, event_queue: asyncio.Queue[Event]):
         """Cancel the current execution."""
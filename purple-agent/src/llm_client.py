@@ -1,9 +1,91 @@
 """LiteLLM integration for provider-agnostic LLM access."""
 
+import asyncio
+import hashlib
 import os
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import AsyncIterator, Optional
 
-import litellm
+import httpx
+import msgspec
+
+try:
+    import h2  # noqa: F401  # required by httpx for HTTP/2
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_JSON_SUFFIX = "\n\nIMPORTANT: Respond with valid JSON only. No additional text."
+_DEFAULT_JSON_SYSTEM = _JSON_SUFFIX.lstrip("\n")
+
+# Response cache bounds
+MEMORY_CACHE_ENTRIES = 256
+DISK_CACHE_BYTES = 256 * 1024 * 1024
+
+# Connection pool shared by every LLM request; completions can stream for
+# minutes, so only connecting is bounded tightly
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64)
+
+
+# Providers that only cache a prompt prefix when it is explicitly marked;
+# OpenAI-compatible APIs cache long prefixes automatically
+_PROMPT_CACHING_PROVIDERS = frozenset({"anthropic"})
+
+
+@lru_cache(maxsize=32)
+def _build_system(system_prompt: str) -> dict:
+    """Build a system message.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    return {"role": "system", "content": system_prompt}
+
+
+@lru_cache(maxsize=32)
+def _build_json_system(system_prompt: Optional[str]) -> dict:
+    """Build the system message for JSON-mode completions.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    json_system = system_prompt + _JSON_SUFFIX if system_prompt else _DEFAULT_JSON_SYSTEM
+    return {"role": "system", "content": json_system}
+
+
+def _mark_cache_breakpoint(messages: list[dict]) -> None:
+    """Mark the last message as the end of a cacheable prompt prefix.
+
+    The system prompt alone is below Anthropic's minimum cacheable length, so
+    the breakpoint goes on the newest message: the cached prefix then covers
+    the system prompt plus the conversation so far, and the next turn reads
+    it back through the provider's lookback from its own breakpoint. The last
+    message is replaced by a marked copy, leaving the caller's dict untouched.
+    """
+    if not messages:
+        return
+    last = messages[-1]
+    content = last.get("content")
+    if type(content) is str:
+        content = [{"type": "text", "text": content}]
+    elif type(content) is list and content:
+        content = [*content[:-1], {**content[-1]}]
+    else:
+        return
+    content[-1]["cache_control"] = {"type": "ephemeral"}
+    messages[-1] = {**last, "content": content}
+
+
+async def _close_stream(response) -> None:
+    """Close a LiteLLM streaming response and its underlying HTTP stream."""
+    aclose = getattr(response, "aclose", None)
+    if aclose is None:
+        # Older LiteLLM wrappers lack aclose; close the wrapped stream instead
+        aclose = getattr(getattr(response, "completion_stream", None), "aclose", None)
+    if aclose is not None:
+        await aclose()
 
 
 class LLMClient:
@@ -44,6 +126,8 @@ class LLMClient:
         temperature: float = 0.0,
         api_key: Optional[str] = None,
         api_base: Optional[str] = None,
+        sync_completion: bool = False,
+        cache_dir: Optional[str] = None,
     ):
         """Initialize the LLM client.
 
@@ -53,6 +137,9 @@ class LLMClient:
             temperature: Sampling temperature (0.0 = deterministic)
             api_key: Override API key (otherwise uses environment variable)
             api_base: Override API base URL (otherwise uses environment variable)
+            sync_completion: Call the blocking litellm.completion on a dedicated
+                thread pool instead of litellm.acompletion
+            cache_dir: Directory for the on-disk response cache (temperature 0 only)
         """
         self.model = model
         self.max_tokens = max_tokens
@@ -65,6 +152,11 @@ class LLMClient:
         self.api_key = api_key or self._get_api_key()
         self.api_base = api_base or self._get_api_base()
 
+        # Import LiteLLM on first use; it pulls in every provider SDK
+        import litellm
+
+        self._litellm = litellm
+
         # Configure LiteLLM
         litellm.drop_params = True  # Drop unsupported params gracefully
 
@@ -72,6 +164,37 @@ class LLMClient:
         if os.getenv("LITELLM_VERBOSE", "").lower() == "true":
             litellm.set_verbose = True
 
+        # Reuse pooled keep-alive connections across turns instead of a new
+        # TLS handshake per request
+        if litellm.aclient_session is None:
+            litellm.aclient_session = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS
+            )
+        if sync_completion and litellm.client_session is None:
+            litellm.client_session = httpx.Client(
+                http2=HTTP2_AVAILABLE, timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS
+            )
+
+        # Mark the growing conversation prefix for provider-side caching
+        self._prompt_caching = self.provider in _PROMPT_CACHING_PROVIDERS
+
+        # Completion kwargs never change after construction
+        self._base_kwargs = self._get_completion_kwargs()
+
+        # Own pool for the blocking path so it doesn't compete with to_thread callers
+        self.sync_completion = sync_completion
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+        # Responses are deterministic at temperature 0, so identical requests
+        # are answered from memory, then from disk if a cache_dir is given
+        self._cache_enabled = temperature == 0.0
+        self._memory_cache: OrderedDict[str, str] = OrderedDict()
+        self._disk_cache = None
+        if self._cache_enabled and cache_dir:
+            import diskcache
+
+            self._disk_cache = diskcache.Cache(cache_dir, size_limit=DISK_CACHE_BYTES)
+
     def _extract_provider(self, model: str) -> str:
         """Extract provider name from model string."""
         if "/" in model:
@@ -125,32 +248,133 @@ class LLMClient:
 
         return kwargs
 
+    async def _run(self, fn, **kwargs):
+        """Run a blocking function on the client's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, **kwargs))
+
+    async def _acompletion(self, **kwargs):
+        """Dispatch a completion through the async or thread-pooled sync API."""
+        if self.sync_completion:
+            return await self._run(self._litellm.completion, **kwargs)
+        return await self._litellm.acompletion(**kwargs)
+
+    def _cache_key(self, kwargs: dict) -> Optional[str]:
+        """Hash the request into a cache key, or None if caching is disabled."""
+        if not self._cache_enabled:
+            return None
+        # Everything that can change the response: model, sampling and token
+        # limits, endpoint, API version, response_format and the messages. The
+        # API key only authenticates, and shouldn't end up hashed on disk.
+        payload = msgspec.json.encode(
+            {key: value for key, value in kwargs.items() if key != "api_key"},
+            order="sorted",
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    async def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        """Look up a cached response in memory, then on disk.
+
+        Disk (SQLite) access runs on the client's thread pool, off the event loop.
+        """
+        if key is None:
+            return None
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            self._memory_cache.move_to_end(key)
+            return cached
+        if self._disk_cache is not None:
+            cached = await self._run(self._disk_cache.get, key=key)
+            if cached is not None:
+                self._remember(key, cached)
+        return cached
+
+    async def _cache_set(self, key: Optional[str], content: Optional[str]) -> None:
+        """Store a response in the memory and disk caches."""
+        if key is None or not content:
+            return
+        self._remember(key, content)
+        if self._disk_cache is not None:
+            await self._run(self._disk_cache.set, key=key, value=content)
+
+    def _remember(self, key: str, content: str) -> None:
+        """Add a response to the in-memory LRU cache."""
+        self._memory_cache[key] = content
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > MEMORY_CACHE_ENTRIES:
+            self._memory_cache.popitem(last=False)
+
+    def _format_messages(
+        self, messages: list[dict], system_prompt: Optional[str]
+    ) -> list[dict]:
+        """Put the system prompt (if provided) before the conversation messages."""
+        if system_prompt:
+            formatted_messages = [_build_system(system_prompt), *messages]
+        else:
+            formatted_messages = list(messages)
+        if self._prompt_caching:
+            _mark_cache_breakpoint(formatted_messages)
+        return formatted_messages
+
     async def complete(
         self,
         messages: list[dict],
         system_prompt: Optional[str] = None,
     ) -> str:
         """Generate a completion from the LLM."""
-        formatted_messages = []
+        kwargs = {
+            **self._base_kwargs,
+            "messages": self._format_messages(messages, system_prompt),
+        }
 
-        # Add system prompt if provided
-        if system_prompt:
-            formatted_messages.append(
-                {
-                    "role": "system",
-                    "content": system_prompt,
-                }
-            )
+        key = self._cache_key(kwargs)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        response = await self._acompletion(**kwargs)
 
-        # Add conversation messages
-        formatted_messages.extend(messages)
+        content = response.choices[0].message.content
+        await self._cache_set(key, content)
+        return content
 
-        kwargs = self._get_completion_kwargs()
-        kwargs["messages"] = formatted_messages
+    async def stream(
+        self,
+        messages: list[dict],
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion from the LLM as text deltas.
+
+        Always uses the async API. A fully consumed stream is cached like
+        complete(), and shares its cache entries.
+        """
+        kwargs = {
+            **self._base_kwargs,
+            "messages": self._format_messages(messages, system_prompt),
+        }
+
+        key = self._cache_key(kwargs)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
 
-        response = await litellm.acompletion(**kwargs)
+        response = await self._litellm.acompletion(**kwargs, stream=True)
 
-        return response.choices[0].message.content
+        parts = []
+        try:
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        finally:
+            # Closing the generator early (e.g. once the planner has its
+            # action) must also drop the upstream HTTP stream, or the provider
+            # keeps generating the rest of the completion
+            await _close_stream(response)
+
+        await self._cache_set(key, "".join(parts))
 
     async def complete_with_json(
         self,
@@ -158,31 +382,31 @@ class LLMClient:
         system_prompt: Optional[str] = None,
     ) -> str:
         """Generate a completion with JSON response format hint."""
-        # Add JSON instruction to system prompt
-        json_system = system_prompt or ""
-        json_system += "\n\nIMPORTANT: Respond with valid JSON only. No additional text."
+        # System prompt with the JSON instruction appended
+        formatted_messages = [_build_json_system(system_prompt), *messages]
+        if self._prompt_caching:
+            _mark_cache_breakpoint(formatted_messages)
 
-        formatted_messages = [
-            {
-                "role": "system",
-                "content": json_system,
-            }
-        ]
-        formatted_messages.extend(messages)
-
-        kwargs = self._get_completion_kwargs()
-        kwargs["messages"] = formatted_messages
+        kwargs = {**self._base_kwargs, "messages": formatted_messages}
 
         # Try to use response_format if supported
+        kwargs["response_format"] = {"type": "json_object"}
+
+        key = self._cache_key(kwargs)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
-            kwargs["response_format"] = {"type": "json_object"}
-            response = await litellm.acompletion(**kwargs)
+            response = await self._acompletion(**kwargs)
         except Exception:
             # Fallback without response_format
             kwargs.pop("response_format", None)
-            response = await litellm.acompletion(**kwargs)
+            response = await self._acompletion(**kwargs)
 
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        await self._cache_set(key, content)
+        return content
 
     def get_model_info(self) -> dict:
         """Get information about the current model configuration."""
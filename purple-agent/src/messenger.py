@@ -1,7 +1,58 @@
 """A2A messaging utilities for the purple agent."""
 
-import json
-from typing import Any
+from typing import Any, Optional, Union
+
+import msgspec
+
+
+class TaskInstruction(msgspec.Struct, tag_field="type", tag="task_instruction"):
+    """Task instruction sent by the green agent."""
+
+    task_id: str = ""
+    instruction: str = ""
+    context: dict = {}
+
+
+class CommandResult(msgspec.Struct, tag_field="type", tag="command_result"):
+    """Result of a command the green agent executed in the sandbox."""
+
+    task_id: str = ""
+    stdout: str = ""
+    stderr: str = ""
+    # Docker reports a null exit code when the process state is unknown
+    exit_code: Optional[int] = -1
+    timed_out: bool = False
+
+
+class CommandSpec(msgspec.Struct):
+    """A command for the green agent to execute."""
+
+    command: str
+    timeout: int = 30
+    workdir: Optional[str] = None
+
+
+class ExecuteResponse(msgspec.Struct, tag_field="action", tag="execute"):
+    """Response asking the green agent to execute a command."""
+
+    command: CommandSpec
+    reasoning: str = ""
+
+
+class CompleteResponse(msgspec.Struct, tag_field="action", tag="complete"):
+    """Response signalling that the task is complete."""
+
+    reasoning: str = ""
+
+
+# Incoming requests, dispatched on their "type" field
+IncomingMessage = Union[TaskInstruction, CommandResult]
+
+REQUEST_DECODER = msgspec.json.Decoder(IncomingMessage)
+RESPONSE_ENCODER = msgspec.json.Encoder()
+
+_TASK_INSTRUCTION_DECODER = msgspec.json.Decoder(TaskInstruction)
+_COMMAND_RESULT_DECODER = msgspec.json.Decoder(CommandResult)
 
 
 class MessageFormatter:
@@ -13,61 +64,35 @@ class MessageFormatter:
         reasoning: str = "",
         timeout: int = 30,
         workdir: str | None = None,
-    ) -> dict:
+    ) -> ExecuteResponse:
         """Format an execute command response."""
-        cmd_obj = {
-            "command": command,
-            "timeout": timeout,
-        }
-        if workdir:
-            cmd_obj["workdir"] = workdir
-
-        return {
-            "action": "execute",
-            "command": cmd_obj,
-            "reasoning": reasoning,
-        }
+        return ExecuteResponse(
+            command=CommandSpec(command=command, timeout=timeout, workdir=workdir),
+            reasoning=reasoning,
+        )
 
     @staticmethod
-    def format_complete_response(reasoning: str = "") -> dict:
+    def format_complete_response(reasoning: str = "") -> CompleteResponse:
         """Format a task completion response."""
-        return {
-            "action": "complete",
-            "reasoning": reasoning,
-        }
+        return CompleteResponse(reasoning=reasoning)
+
+    @staticmethod
+    def encode_response(response: Any) -> str:
+        """Encode a response struct or dict as JSON text for a TextPart."""
+        return RESPONSE_ENCODER.encode(response).decode()
 
     @staticmethod
-    def parse_command_result(message: str) -> dict:
+    def parse_command_result(message: str) -> CommandResult:
         """Parse a command result from a message."""
         try:
-            data = json.loads(message)
-            return {
-                "stdout": data.get("stdout", ""),
-                "stderr": data.get("stderr", ""),
-                "exit_code": data.get("exit_code", -1),
-                "timed_out": data.get("timed_out", False),
-            }
-        except json.JSONDecodeError:
-            return {
-                "stdout": message,
-                "stderr": "",
-                "exit_code": 0,
-                "timed_out": False,
-            }
+            return _COMMAND_RESULT_DECODER.decode(message)
+        except msgspec.DecodeError:
+            return CommandResult(stdout=message, exit_code=0)
 
     @staticmethod
-    def parse_task_instruction(message: str) -> dict:
+    def parse_task_instruction(message: str) -> TaskInstruction:
         """Parse a task instruction from a message."""
         try:
-            data = json.loads(message)
-            return {
-                "task_id": data.get("task_id", ""),
-                "instruction": data.get("instruction", ""),
-                "context": data.get("context", {}),
-            }
-        except json.JSONDecodeError:
-            return {
-                "task_id": "",
-                "instruction": message,
-                "context": {},
-            }
+            return _TASK_INSTRUCTION_DECODER.decode(message)
+        except msgspec.DecodeError:
+            return TaskInstruction(instruction=message)
@@ -2,10 +2,39 @@
 
 import json
 import re
+from functools import lru_cache
 from typing import Optional
 
+import msgspec
+
 from .llm_client import LLMClient
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Keys of actions that are already in canonical form
+_EXECUTE_KEYS = frozenset({"action", "command", "reasoning"})
+_COMPLETE_KEYS = frozenset({"action", "reasoning"})
+
+# A non-blank line that isn't a comment, with surrounding whitespace and an
+# optional "$" prompt stripped
+_CMD_LINE_RE = re.compile(
+    r"^[^\S\n]*(?![^\S\n]|#|//)\$?[^\S\n]*(\S.*?)[^\S\n]*$", re.MULTILINE
+)
+
+# Phrases that mark a line as explanation text rather than a command
+_EXPLAIN_RE = re.compile(r"i will|let me|i'll|let's|we can|we should", re.IGNORECASE)
+
+# First words that mark a line as a shell command
+_COMMON_COMMANDS = frozenset(
+    {
+        "ls", "cd", "cat", "echo", "mkdir", "touch", "rm", "cp", "mv",
+        "find", "grep", "sed", "awk", "head", "tail", "pwd", "chmod",
+        "chown", "tar", "gzip", "unzip", "curl", "wget", "python",
+        "pip", "npm", "node", "git", "docker", "make", "test", "bash",
+        "sh", "export", "source", "which", "whereis", "df", "du",
+    }
+)
+
 
 SYSTEM_PROMPT = """You are an expert terminal agent that completes tasks by executing shell commands.
 
@@ -58,8 +87,11 @@ Remember: Respond ONLY with valid JSON. No additional text or explanation outsid
 class TaskPlanner:
     """Plans terminal commands to complete tasks using LLM."""
 
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, streaming: bool = False):
         self.llm_client = llm_client
+        self.streaming = streaming
+        # Identical responses recur at temperature 0; parse each one once
+        self._parse_cached = lru_cache(maxsize=1024)(self._parse_response)
 
     async def plan_next_action(
         self,
@@ -68,12 +100,58 @@ class TaskPlanner:
         context: dict,
     ) -> dict:
         """Plan the next action based on task and history."""
+        if self.streaming:
+            return await self.plan_next_action_streaming(instruction, history, context)
+
         response = await self.llm_client.complete(
             messages=history,
             system_prompt=SYSTEM_PROMPT,
         )
 
-        return self._parse_response(response)
+        return self._parse(response)
+
+    async def plan_next_action_streaming(
+        self,
+        instruction: str,
+        history: list[dict],
+        context: dict,
+    ) -> dict:
+        """Plan the next action, returning as soon as a complete action has streamed in.
+
+        Each time the streamed text ends with a closing brace, it is parsed
+        from its first opening brace; the rest of the stream is dropped once
+        that yields an action. Otherwise the full response is parsed as usual.
+        """
+        parts = []
+        stream = self.llm_client.stream(messages=history, system_prompt=SYSTEM_PROMPT)
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                if not delta.rstrip().endswith("}"):
+                    continue
+
+                buffer = "".join(parts)
+                start = buffer.find("{")
+                if start == -1:
+                    continue
+                try:
+                    data = msgspec.json.decode(buffer[start:])
+                except msgspec.DecodeError:
+                    continue
+                if type(data) is dict and "action" in data:
+                    return self._validate_action(data)
+        finally:
+            await stream.aclose()
+
+        return self._parse("".join(parts))
+
+    def _parse(self, response: str) -> dict:
+        """Parse an LLM response through the cache, returning a private copy."""
+        action = self._parse_cached(response)
+        command = action.get("command")
+        if type(command) is dict:
+            return {**action, "command": {**command}}
+        return {**action}
 
     def _parse_response(self, response: str) -> dict:
         """Parse LLM response into action dict."""
@@ -82,25 +160,36 @@ class TaskPlanner:
 
         # Try direct JSON parse first
         try:
-            return self._validate_action(json.loads(response))
-        except json.JSONDecodeError:
+            return self._validate_action(msgspec.json.decode(response))
+        except msgspec.DecodeError:
             pass
 
         # Try to find JSON in markdown code block
-        json_match = re.search(r"```(?:json)?\s*(.*?)```", response, re.DOTALL)
-        if json_match:
-            try:
-                return self._validate_action(json.loads(json_match.group(1)))
-            except json.JSONDecodeError:
-                pass
+        start = response.find("```")
+        if start != -1:
+            start += 3
+            if response.startswith("json", start):
+                start += 4
+            end = response.find("```", start)
+            if end != -1:
+                try:
+                    # The decoder skips whitespace around the object itself
+                    return self._validate_action(msgspec.json.decode(response[start:end]))
+                except msgspec.DecodeError:
+                    pass
 
-        # Try to find raw JSON object
-        json_match = re.search(r"\{.*\}", response, re.DOTALL)
-        if json_match:
+        # Try to find a raw JSON action object, starting at each opening brace
+        idx = response.find("{")
+        while idx != -1:
             try:
-                return self._validate_action(json.loads(json_match.group(0)))
+                data, _ = _JSON_DECODER.raw_decode(response, idx)
             except json.JSONDecodeError:
                 pass
+            else:
+                # Skip stray objects like {} or {"debug": true} before the action
+                if type(data) is dict and "action" in data:
+                    return self._validate_action(data)
+            idx = response.find("{", idx + 1)
 
         # Fallback: try to interpret as command
         return self._interpret_as_command(response)
@@ -111,13 +200,21 @@ class TaskPlanner:
 
         if action == "execute":
             command = data.get("command", {})
-            if isinstance(command, str):
+            # Well-formed actions are returned as they are
+            if (
+                data.keys() == _EXECUTE_KEYS
+                and type(command) is dict
+                and "command" in command
+                and "timeout" in command
+            ):
+                return data
+
+            command_type = type(command)
+            if command_type is str:
                 command = {"command": command, "timeout": 30}
-            elif isinstance(command, dict):
-                if "command" not in command:
-                    command["command"] = ""
-                if "timeout" not in command:
-                    command["timeout"] = 30
+            elif command_type is dict:
+                command.setdefault("command", "")
+                command.setdefault("timeout", 30)
 
             return {
                 "action": "execute",
@@ -125,6 +222,9 @@ class TaskPlanner:
                 "reasoning": data.get("reasoning", ""),
             }
         else:
+            if action == "complete" and data.keys() == _COMPLETE_KEYS:
+                return data
+
             return {
                 "action": "complete",
                 "reasoning": data.get("reasoning", ""),
@@ -133,22 +233,12 @@ class TaskPlanner:
     def _interpret_as_command(self, response: str) -> dict:
         """Try to interpret a non-JSON response as a command."""
         # Look for common command patterns
-        lines = response.strip().split("\n")
-
-        for line in lines:
-            line = line.strip()
-            # Skip common non-command patterns
-            if not line or line.startswith("#") or line.startswith("//"):
-                continue
+        for match in _CMD_LINE_RE.finditer(response):
+            line = match.group(1)
             # Skip if it looks like explanation text
-            if any(
-                phrase in line.lower()
-                for phrase in ["i will", "let me", "i'll", "let's", "we can", "we should"]
-            ):
+            if _EXPLAIN_RE.search(line):
                 continue
             # Check if it looks like a command
-            if line.startswith("$"):
-                line = line[1:].strip()
             if self._looks_like_command(line):
                 return {
                     "action": "execute",
@@ -159,18 +249,13 @@ class TaskPlanner:
         # Default to completion if no command found
         return {
             "action": "complete",
-            "reasoning": response[:200] if len(response) > 200 else response,
+            "reasoning": response[:200],
         }
 
     def _looks_like_command(self, text: str) -> bool:
         """Check if text looks like a shell command."""
-        common_commands = [
-            "ls", "cd", "cat", "echo", "mkdir", "touch", "rm", "cp", "mv",
-            "find", "grep", "sed", "awk", "head", "tail", "pwd", "chmod",
-            "chown", "tar", "gzip", "unzip", "curl", "wget", "python",
-            "pip", "npm", "node", "git", "docker", "make", "test", "bash",
-            "sh", "export", "source", "which", "whereis", "df", "du",
-        ]
-        first_word = text.split()[0] if text.split() else ""
-        first_word = first_word.lstrip("./")
-        return first_word in common_commands or "/" in text.split()[0] if text.split() else False
+        parts = text.split(maxsplit=1)
+        if not parts:
+            return False
+        first = parts[0]
+        return first.lstrip("./") in _COMMON_COMMANDS or "/" in first
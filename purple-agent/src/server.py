@@ -3,18 +3,35 @@
 import argparse
 import os
 import sys
+from dataclasses import fields
 from pathlib import Path
 
-import uvicorn
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    from a2a.utils.constants import PREV_AGENT_CARD_WELL_KNOWN_PATH
+except ImportError:
+    # a2a-sdk 0.2.x has no deprecated card path
+    PREV_AGENT_CARD_WELL_KNOWN_PATH = None
 
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.config import AgentConfig
 from src.executor import PurpleAgentExecutor
 
+try:
+    import uvloop  # noqa: F401
+
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    # uvloop is unavailable on Windows
+    EVENT_LOOP = "asyncio"
+
 
 def create_agent_card(host: str, port: int) -> AgentCard:
     """Create the agent card for the purple agent."""
@@ -40,7 +57,40 @@ def create_agent_card(host: str, port: int) -> AgentCard:
     )
 
 
+class CachedCardApplication(A2AStarletteApplication):
+    """A2A application that serves the agent card from pre-serialized JSON.
+
+    A card_modifier (a2a-sdk 0.3+) may change the card on every request, so
+    with one the stock handler serves the card uncached.
+    """
+
+    def __init__(self, agent_card: AgentCard, **kwargs):
+        super().__init__(agent_card=agent_card, **kwargs)
+        # Without a modifier the card never changes, so serialize it once
+        # instead of per request
+        self._agent_card_json: bytes | None = None
+        if getattr(self, "card_modifier", None) is None:
+            self._agent_card_json = agent_card.model_dump_json(
+                exclude_none=True,
+                by_alias=True,
+            ).encode()
+
+    async def _handle_get_agent_card(self, request: Request) -> Response:
+        # The stock handler applies card_modifier and logs the deprecation
+        # warning for the old well-known path
+        if (
+            self._agent_card_json is None
+            or request.url.path == PREV_AGENT_CARD_WELL_KNOWN_PATH
+        ):
+            return await super()._handle_get_agent_card(request)
+        return Response(content=self._agent_card_json, media_type="application/json")
+
+
 def main():
+    # Only needed to serve; importing this module for the card or app class
+    # shouldn't pull in the server stack
+    import uvicorn
+
     parser = argparse.ArgumentParser(
         description="Terminal Agent - LLM-powered task executor",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -104,25 +154,53 @@ Environment Variables:
         default=0.0,
         help="LLM sampling temperature (default: 0.0)",
     )
+    parser.add_argument(
+        "--history-window",
+        type=int,
+        default=40,
+        help="Most recent conversation turns sent to the LLM per task (default: 40)",
+    )
+    parser.add_argument(
+        "--speculative-planning",
+        action="store_true",
+        help="Plan the next action while a command runs, assuming it succeeds "
+        "silently (costs an extra LLM call when the guess is wrong)",
+    )
+    parser.add_argument(
+        "--sync-completion",
+        action="store_true",
+        help="Call the blocking LiteLLM completion API on a dedicated thread pool",
+    )
+    parser.add_argument(
+        "--summarize-history",
+        action="store_true",
+        help="Summarize turns that fall out of the history window instead of "
+        "dropping them (costs an extra LLM call per summary)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the on-disk LLM response cache, used at temperature 0",
+    )
+    parser.add_argument(
+        "--stream-planning",
+        action="store_true",
+        help="Stream LLM responses and act as soon as a complete action arrives",
+    )
 
     args = parser.parse_args()
 
     agent_card = create_agent_card(args.host, args.port)
 
-    executor = PurpleAgentExecutor(
-        model=args.model,
-        max_tokens=args.max_tokens,
-        temperature=args.temperature,
-        api_key=args.api_key,
-        api_base=args.api_base,
-    )
+    config = AgentConfig(**{f.name: getattr(args, f.name) for f in fields(AgentConfig)})
+    executor = PurpleAgentExecutor(config)
 
     request_handler = DefaultRequestHandler(
         agent_executor=executor,
         task_store=None,
     )
 
-    app = A2AStarletteApplication(
+    app = CachedCardApplication(
         agent_card=agent_card,
         http_handler=request_handler,
     )
@@ -135,7 +213,14 @@ Environment Variables:
     print(f"Max Tokens: {args.max_tokens}, Temperature: {args.temperature}")
     print("-" * 50)
 
-    uvicorn.run(app.build(), host=args.host, port=args.port)
+    uvicorn.run(
+        app.build(),
+        host=args.host,
+        port=args.port,
+        loop=EVENT_LOOP,
+        http="httptools",
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
 """A2A message type definitions for TerminalBench evaluation."""
 
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ActionType(str, Enum):
@@ -15,6 +15,8 @@ class ActionType(str, Enum):
 class Command(BaseModel):
     """A command to execute in the sandbox."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     command: str = Field(..., description="The shell command to execute")
     timeout: int = Field(default=30, description="Command timeout in seconds")
     workdir: Optional[str] = Field(default=None, description="Working directory")
@@ -23,6 +25,8 @@ class Command(BaseModel):
 class TaskInstruction(BaseModel):
     """Message from green agent to purple agent with task details."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     task_id: str = Field(..., description="Unique task identifier")
     instruction: str = Field(..., description="Natural language task instruction")
     context: dict = Field(
@@ -34,6 +38,8 @@ class TaskInstruction(BaseModel):
 class CommandResult(BaseModel):
     """Result of executing a command in the sandbox."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     stdout: str = Field(default="", description="Standard output")
     stderr: str = Field(default="", description="Standard error")
     exit_code: int = Field(..., description="Exit code (0 = success)")
@@ -43,7 +49,11 @@ class CommandResult(BaseModel):
 class AgentResponse(BaseModel):
     """Response from purple agent to green agent."""
 
-    action: ActionType = Field(..., description="Action type: execute or complete")
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    action: Literal["execute", "complete"] = Field(
+        ..., description="Action type: execute or complete"
+    )
     command: Optional[Command] = Field(
         default=None, description="Command to execute (if action=execute)"
     )
@@ -55,6 +65,8 @@ class AgentResponse(BaseModel):
 class EvaluationResult(BaseModel):
     """Result of evaluating a single task."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     task_id: str = Field(..., description="Task identifier")
     passed: bool = Field(..., description="Whether the task was completed successfully")
     reward: float = Field(default=0.0, description="Reward score (0.0 to 1.0)")
@@ -66,6 +78,8 @@ class EvaluationResult(BaseModel):
 class BenchmarkResults(BaseModel):
     """Aggregated results for a benchmark run."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     dataset: str = Field(..., description="Dataset name")
     total_tasks: int = Field(..., description="Total number of tasks")
     passed: int = Field(..., description="Number of tasks passed")